@@ -1,24 +1,22 @@
 import typer
-import inquirer
-import sys
 import json
-from tomlkit import document, table, dumps, parse
+import sys
 
 from pathlib import Path
 import os
 from dotenv import load_dotenv
-import requests
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from rich.console import Console
-from rich_pyfiglet import RichFiglet
 from rich.table import Table
 from rich import box
-from rich.panel import Panel
 
 from .utils import cloudflare, formatting, linode, env_file
+from .utils.http_client import cached_get
 
 import subprocess, secrets, string
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 
 load_dotenv()
 console = Console()
@@ -27,10 +25,25 @@ app = typer.Typer()
 # Default env. choices for prompts
 ENV_CHOICES = ["dev", "staging", "prod"]
 
+# Section order of the per-env <env>-config.toml files
+_CONFIG_SECTIONS = ("project", "environment", "linode", "cloudflare", "stripe", "sendgrid", "domain")
+
+# Lower-cased continent name -> display name, so `--continent europe` works
+_CONTINENT_ALIAS = {c.lower(): c for c in linode.CONTINENT_CHOICES if c != "Show all regions"}
+
+# Linode plan classes and OS vendors offered during `init`
+_INSTANCE_CLASSES = ("nanode", "standard", "dedicated", "premium")
+_OS_VENDORS = (
+    "AlmaLinux", "Alpine", "Arch", "CentOS", "Debian", "Fedora", "Kali", "Gentoo",
+    "OpenSuse", "Rocky Linux", "Slackware", "Ubuntu",
+)
+
 def select_environments() -> List[str]:
     """
     Ask which environments to set up. Supports dev/staging/prod or custom list.
     """
+    import inquirer
+
     answers = inquirer.prompt([
         inquirer.Checkbox(
             "envs",
@@ -47,6 +60,135 @@ def select_environments() -> List[str]:
         raise typer.Exit(1)
     return envs
 
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Writes `data` to a sibling temp file and renames it over `path`, so a crash
+    mid-write never leaves a truncated config behind.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _parse_tags(raw: str) -> List[str]:
+    """Splits a comma-separated tag string, dropping blanks (e.g. from a trailing comma)."""
+    return [t.strip() for t in raw.split(",") if t.strip()]
+
+def _prompt_env_settings(env: str, settings: Dict[str, Tuple[Any, bool]]) -> Dict[str, Any]:
+    """
+    Asks the per-env backups/tags/Stripe/SendGrid questions as one inquirer
+    form. `settings` maps each question to (default, answered); answered
+    questions aren't asked and take their default. When no TTY is attached
+    (piped/scripted runs) the same questions fall back to plain typer prompts,
+    which read stdin. Exits if the form is cancelled.
+    """
+    answers = {name: default for name, (default, _) in settings.items()}
+    pending = {name for name, (_, answered) in settings.items() if not answered}
+    if not pending:
+        return answers
+
+    if not sys.stdin.isatty():
+        if "backups" in pending:
+            answers["backups"] = typer.confirm(f"Enable backups for {env}?", default=answers["backups"])
+        if "tags" in pending:
+            answers["tags"] = typer.prompt(f"Tags for {env} instance (comma-separated)", default=answers["tags"])
+        if "stripe" in pending:
+            answers["stripe"] = typer.prompt(f"Stripe API key ({env})", default="", show_default=False, hide_input=True)
+        if "sendgrid" in pending:
+            answers["sendgrid"] = typer.prompt(f"SendGrid API key ({env})", default="", show_default=False, hide_input=True)
+        return answers
+
+    import inquirer
+
+    form = inquirer.prompt([
+        inquirer.Confirm("backups", message=f"Enable backups for {env}?",
+            default=answers["backups"], ignore="backups" not in pending),
+        # an empty answer means no tags
+        inquirer.Text("tags", message=f"Tags for {env} instance (comma-separated)",
+            default=answers["tags"], ignore="tags" not in pending),
+        inquirer.Password("stripe", message=f"Stripe API key ({env})",
+            default=answers["stripe"], ignore="stripe" not in pending),
+        inquirer.Password("sendgrid", message=f"SendGrid API key ({env})",
+            default=answers["sendgrid"], ignore="sendgrid" not in pending),
+    ])
+    if not form:
+        raise typer.Exit(1)
+    return form
+
+def _fetch_dns_index(domain: str, cloudflare_api_key: str, no_cache: bool
+                     ) -> Tuple[Optional[str], Optional[FrozenSet[Tuple[str, str]]], Optional[str]]:
+    """
+    Looks up the Cloudflare zone for `domain` and indexes its A/CNAME records
+    (see `cloudflare.build_dns_index`).
+    Safe to run off the main thread: it never prompts or prints, and network
+    failures are returned rather than raised (the report is informational, so
+    it must not cost the user their answers).
+    Returns (zone_id, dns_index, error); on failure dns_index is None and
+    error is the message for the caller to print.
+    """
+    zone_id = cloudflare.get_cloudflare_zone_id(domain, cloudflare_api_key,
+        ttl=0 if no_cache else cloudflare.ZONE_ID_TTL)
+    if not zone_id:
+        return None, None, f"[red]Error fetching Zone ID for domain {domain}[/red]"
+    dns_records = cloudflare.get_cloudflare_dns_records(zone_id, cloudflare_api_key,
+        ttl=0 if no_cache else cloudflare.DNS_RECORDS_TTL)
+    if dns_records is None:
+        return zone_id, None, f"[red]Error fetching DNS records for zone ID {zone_id}[/red]"
+    return zone_id, cloudflare.build_dns_index(dns_records), None
+
+def _catalog_result(future: "Future[Any]", what: str) -> Any:
+    """
+    Returns a background Linode catalog fetch's parsed body, or exits with a
+    red message if it failed (connection error/timeout, retries exhausted on
+    429/5xx, or a non-JSON error page) instead of dumping a traceback.
+    """
+    # Only reached once a fetch was submitted, so requests is already loaded
+    import requests
+
+    try:
+        return future.result()
+    except (requests.RequestException, ValueError) as e:
+        console.print(f"[red]Couldn't fetch the Linode {what} catalog: {e}[/red]")
+        raise typer.Exit(1)
+
+def _dns_availability_lines(dns_index: FrozenSet[Tuple[str, str]], env: str, domain: str) -> List[str]:
+    """
+    Builds the availability report (Rich markup, one entry per hostname) for the
+    hostnames `env` will use under `domain`.
+    """
+    color = formatting.ENV_COLORS[env]
+    open_tag, close_tag = f"[bold][{color}]", f"[/{color}][/bold]"
+    lines: List[str] = []
+
+    if env == "prod":
+        env_label = f"{open_tag}production{close_tag}"
+        if cloudflare.root_domain_is_availabile(dns_index, domain):
+            lines.append(f"[bold]{domain}[/bold] (the root domain) is available!\n It will be used to host the [bold]front end[/bold] server for the {env_label} environment.")
+        else:
+            lines.append(f"[red][bold]Warning![/bold] The root domain [bold]{domain}[/bold] has an existing A or CNAME record! It will be overwritten![/red]")
+
+        if cloudflare.subdomain_is_available(dns_index, "www", domain):
+            lines.append(f"[bold]www.{domain}[/bold] subdomain is available!")
+        else:
+            lines.append(f"[red][bold]Warning![/bold] The [bold]www.{domain}[/bold] has an existing A or CNAME record! It will be overwritten![/red]")
+
+        if cloudflare.subdomain_is_available(dns_index, "api", domain):
+            lines.append(f"[bold]api.{domain}[/bold] subdomain is available!\nIt will be used to host the [bold]back end[/bold] server for the {env_label} environment.")
+        else:
+            lines.append(f"[red][bold]Warning![/bold] The [bold]api.{domain}[/bold] has an existing A or CNAME record! It will be overwritten![/red]")
+    else:
+        env_label = f"{open_tag}{env}{close_tag}"
+        if cloudflare.subdomain_is_available(dns_index, env, domain):
+            lines.append(f"[bold]{env}.{domain}[/bold] subdomain is available!\nIt will be used to host the [bold]front end[/bold] server for the {env_label} environment.")
+        else:
+            lines.append(f"[red][bold]{env}.{domain}[/bold] subdomain is already taken![/red]")
+
+        if cloudflare.subdomain_is_available(dns_index, f"{env}-api", domain):
+            lines.append(f"[bold]{env}-api.{domain}[/bold] subdomain is available!\nIt will be used to host the [bold]back end[/bold] server for the {env_label} environment.")
+        else:
+            lines.append(f"[red][bold]{env}-api.{domain}[/bold] subdomain is already taken![/red]")
+
+    return lines
+
 @app.command()
 def init(
     project_name: str = typer.Option(
@@ -91,10 +233,29 @@ def init(
     ),
     sendgrid_api_key: str = typer.Option(
         "",
-        help="Your SendGrid API key for payment processing.",
-    )
+        help="Your SendGrid API key, saved to every environment's <env>.env (skips that prompt).",
+    ),
+    env_stripe_api_key: str = typer.Option(
+        "",
+        help="Stripe API key saved to every environment's <env>.env (skips that prompt).",
+    ),
+    yes: bool = typer.Option(
+        False,
+        "--yes", "-y",
+        help="Don't ask the per-environment backups/tags/API key questions; use the options above (or blank).",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Ignore cached Linode/Cloudflare API responses and fetch fresh ones.",
+    ),
 ):
     """Initializes the project configuration."""
+    # Prompt/serialization libraries are only needed here, so they're imported
+    # lazily to keep `--help`, `preview` and `deploy` startup fast.
+    import inquirer
+    import tomli_w
+
     # The banner and links are now part of the init command's execution flow.
     formatting.show_banner()
 
@@ -104,29 +265,31 @@ def init(
     # We'll first need to ensure the .env file exists along with API keys necessary to trigger
     # infrastructure changes.
     env_file.find_or_create_env_file()
-    if not env_file.api_key_present("LINODE_API_KEY"):
-        linode_api_key = typer.prompt("Linode API key", hide_input=True)
-        env_file.add_api_key("LINODE_API_KEY", linode_api_key)
-    else:
-        cloudflare_api_key = os.getenv("LINODE_API_KEY")
+    env_values = env_file.load_all()
+
+    # (.env key, prompt label, value passed on the command line)
+    required_keys = [
+        ("LINODE_API_KEY", "Linode API key", linode_api_key),
+        ("CLOUDFLARE_ACCOUNT_ID", "Cloudflare account ID", ""),
+        ("CLOUDFLARE_API_KEY", "Cloudflare API key", ""),
+        ("STRIPE_API_KEY", "Stripe API key", stripe_api_key),
+    ]
+    missing_keys: Dict[str, str] = {}
+    for key, label, cli_value in required_keys:
+        if env_values.get(key):
+            console.print(f"{key} found.")
+            continue
+        missing_keys[key] = cli_value or typer.prompt(label, hide_input=True)
 
-    if not env_file.api_key_present("CLOUDFLARE_ACCOUNT_ID"):
-        cloudflare_account_id = typer.prompt("Cloudflare account ID", hide_input=True)
-        env_file.add_api_key("CLOUDFLARE_ACCOUNT_ID", cloudflare_account_id)
-    else:
-        cloudflare_account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID")
+    # Persist everything that was prompted for in one rewrite of .env
+    if missing_keys:
+        env_file.add_api_keys(missing_keys)
+        env_values.update(missing_keys)
 
-    if not env_file.api_key_present("CLOUDFLARE_API_KEY"):
-        cloudflare_api_key = typer.prompt("Cloudflare API key", hide_input=True)
-        env_file.add_api_key("CLOUDFLARE_API_KEY", cloudflare_api_key)
-    else:
-        cloudflare_api_key = os.getenv("CLOUDFLARE_API_KEY")
-        
-    if not env_file.api_key_present("STRIPE_API_KEY"):
-        stripe_api_key = typer.prompt("Stripe API key", hide_input=True)
-        env_file.add_api_key("STRIPE_API_KEY", stripe_api_key)
-    else:
-        stripe_api_key = os.getenv("STRIPE_API_KEY")
+    linode_api_key = env_values["LINODE_API_KEY"]
+    cloudflare_account_id = env_values["CLOUDFLARE_ACCOUNT_ID"]
+    cloudflare_api_key = env_values["CLOUDFLARE_API_KEY"]
+    stripe_api_key = env_values["STRIPE_API_KEY"]
 
     # Allow CLI overrides: if both continent and region were provided, skip prompts
     if not linode_region:
@@ -143,139 +306,188 @@ def init(
                 raise typer.Exit(1)
 
         if continent == "Show all regions":
-            region_choices = sum(linode.CONTINENT_TO_REGIONS.values(), [])  # flatten
+            region_choices = linode.ALL_LINODE_REGIONS
         else:
             # normalize if user passed --continent europe
-            norm = continent.strip().lower()
-            alias = {c.lower(): c for c in linode.CONTINENT_CHOICES if c != "Show all regions"}
-            continent = alias.get(norm, continent)
+            continent = _CONTINENT_ALIAS.get(continent.strip().lower(), continent)
             region_choices = linode.CONTINENT_TO_REGIONS.get(continent, [])
 
-        ans = inquirer.prompt([
-            inquirer.List("linode_region",
-                message=f"Select a Linode region{f' in {continent}' if continent!='Show all regions' else ''}",
-                choices=region_choices,
-                carousel=True)
-        ]) or {}
-        linode_region = ans.get("linode_region", "")
+        if len(region_choices) == 1:
+            # Nothing to choose (e.g. South America), so don't draw a prompt
+            linode_region = region_choices[0]
+        else:
+            ans = inquirer.prompt([
+                inquirer.List("linode_region",
+                    message=f"Select a Linode region{f' in {continent}' if continent!='Show all regions' else ''}",
+                    choices=region_choices,
+                    carousel=True)
+            ]) or {}
+            linode_region = ans.get("linode_region", "")
         console.print(f"Selected region: {linode_region}")
-                # Use continent to filter for available Linode types
-        url = "https://api.linode.com/v4/linode/types"
 
-        payload = {}
-        headers = {
-            'Accept': 'application/json',
-            'Authorization': linode_api_key
-        }
+    if not linode_region:
+        raise typer.Exit(1)
+    if linode_region not in linode.REGION_TO_CONTINENT:
+        # Linode adds regions over time, so an unknown slug is only a warning
+        console.print(f"[yellow]Region [bold]{linode_region}[/bold] isn't in ScaleTrail's region list; continuing anyway.[/yellow]")
+    elif continent and continent != "Show all regions":
+        expected = _CONTINENT_ALIAS.get(continent.strip().lower(), continent)
+        if linode_region not in linode.CONTINENT_REGION_SETS.get(expected, frozenset()):
+            console.print(f"[yellow]Region [bold]{linode_region}[/bold] is in {linode.REGION_TO_CONTINENT[linode_region]}, not {expected}.[/yellow]")
+
+    # The types and images catalogs don't depend on each other (or on the
+    # environment selection), so fetch both in the background while the
+    # user picks environments. A catalog is skipped entirely when its choice
+    # was already given with --instance-type / --image.
+    # page_size=500 is Linode's maximum, so each catalog comes back in one page
+    types_url = "https://api.linode.com/v4/linode/types?page_size=500"
+    imgs_url = "https://api.linode.com/v4/images?page_size=500"
+    headers = {
+        # IMPORTANT: Linode expects a Bearer token here:
+        "Authorization": linode_api_key,
+    }
+    # Let Linode drop private and deprecated images server-side; vendor
+    # filtering stays client-side because it's case-insensitive there.
+    imgs_headers = {
+        **headers,
+        "X-Filter": json.dumps({"is_public": True, "deprecated": False}),
+    }
+
+    instances: List[Dict[str, Any]] = []
+    oses: List[Dict[str, Any]] = []
+    executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        # With --domain-to-configure the Cloudflare lookups don't depend on
+        # anything else either, so they run alongside the Linode fetches
+        dns_future = executor.submit(
+            _fetch_dns_index, domain_to_configure, cloudflare_api_key, no_cache) if domain_to_configure else None
+
+        # Both catalogs change rarely, so repeat runs are served from disk
+        catalog_ttl = 0 if no_cache else 3600
+        types_future = None if instance_type else executor.submit(
+            cached_get, types_url, headers=headers, ttl=catalog_ttl, namespace="linode")
+        imgs_future = None if image else executor.submit(
+            cached_get, imgs_url, headers=imgs_headers, ttl=catalog_ttl, namespace="linode")
 
-        response = requests.request("GET", url, headers=headers, data=payload)
         envs = select_environments()
-        console.print("Available Linode instance types:")
-        # region_id could be "us-east", "us-ord", "br-gru", "id-cgk", etc.
-        instances = linode.get_instances_for_region(response.json(), region_id=linode_region,
-            include_classes=["nanode","standard","dedicated","premium"])
-        
-        # After you pick `linode_region` and have a Linode API key:
-        imgs_url = "https://api.linode.com/v4/images"
-        headers = {
-            "Accept": "application/json",
-            # IMPORTANT: Linode expects a Bearer token here:
-            "Authorization": linode_api_key,
-        }
-        imgs_resp = requests.get(imgs_url, headers=headers).json()
-
-        # Filter to OSes available in the chosen region:
-        oses = linode.get_operating_systems_for_region(
-            imgs_resp,
-            region_id=linode_region,
-            include_vendors=["AlmaLinux", "Alpine", "Arch", "CentOS", "Debian", "Fedora", "Kali", "Gentoo", "OpenSuse", "Rocky Linux", "Slackware", "Ubuntu"],   # or e.g. ["Ubuntu", "Debian", "AlmaLinux", "Rocky Linux"]
-            public_only=True,
-            exclude_eol=True,
-        )
 
-        env_instance_types: Dict[str, str] = {}
-        env_os_choices: Dict[str, str] = {}
-        env_backups_enabled: Dict[str, bool] = {}
-        env_instance_tags: Dict[str, List[str]] = {}
-        env_stripe_api_keys: Dict[str, str] = {}
-        env_sendgrid_api_keys: Dict[str, str] = {}
-        for env in envs:
-            console.print(f"\n[bold]Environment:[/bold] {env}")
+        if types_future is not None:
+            console.print("Available Linode instance types:")
+            # region_id could be "us-east", "us-ord", "br-gru", "id-cgk", etc.
+            instances = linode.get_instances_for_region(_catalog_result(types_future, "instance types"),
+                region_id=linode_region,
+                include_classes=_INSTANCE_CLASSES)
+
+        if imgs_future is not None:
+            # Filter to OSes available in the chosen region:
+            oses = linode.get_operating_systems_for_region(
+                _catalog_result(imgs_future, "images"),
+                region_id=linode_region,
+                include_vendors=_OS_VENDORS,
+                public_only=True,
+                exclude_eol=True,
+            )
+    finally:
+        # Not a `with` block: that would wait here for the Cloudflare lookup
+        # too, but dns_future is only needed after the per-env prompts, so let
+        # it keep running while they're answered
+        executor.shutdown(wait=False)
+
+    env_instance_types: Dict[str, str] = {}
+    env_os_choices: Dict[str, str] = {}
+    env_backups_enabled: Dict[str, bool] = {}
+    env_instance_tags: Dict[str, List[str]] = {}
+    env_stripe_api_keys: Dict[str, str] = {}
+    env_sendgrid_api_keys: Dict[str, str] = {}
+    # Every env picks from the same OS list, so render its labels once
+    os_choices = linode.os_choices(oses)
+    for env in envs:
+        console.print(f"\n[bold]Environment:[/bold] {env}")
+        if instance_type:
+            env_instance_types[env] = instance_type
+        else:
             console.print(f"Pick a size for the '{env}' environment (region: {linode_region})\n")
             selected = linode.choose_instance(
                 instances,
                 message=f"Select a Linode plan for {env}"
             )
-            selected_os = linode.choose_os(oses, message=f"Select a Linode OS for {env}")
             if not selected:
                 console.print(f"[red]No instance selected for {env}. Aborting.[/red]")
                 raise typer.Exit(1)
             env_instance_types[env] = selected["id"]
-            env_os_choices[env] = selected_os["id"]
             console.print(f"→ {env}: [bold]{selected['label']}[/bold] ({selected['id']})")
 
-            env_backups_enabled[env] = typer.prompt(f"Enable backups for {env}? (y/n)").lower() == "y"
-            env_instance_tags[env] = typer.prompt(f"Tags for {env} instance (comma-separated)")
-            env_stripe_api_keys[env] = typer.prompt(f"Stripe API key ({env})")
-            env_sendgrid_api_keys[env] = typer.prompt(f"SendGrid API key ({env})")
-
-
-    if not linode_region:
-        raise typer.Exit(1)
+        if image:
+            env_os_choices[env] = image
+        else:
+            selected_os = linode.choose_os(oses, message=f"Select a Linode OS for {env}",
+                                           choices=os_choices)
+            if not selected_os:
+                console.print(f"[red]No OS selected for {env}. Aborting.[/red]")
+                raise typer.Exit(1)
+            env_os_choices[env] = selected_os["id"]
 
-    if not domain_to_configure:
+        # Ask the remaining per-env questions; a question whose option was
+        # given on the command line (or all of them, with --yes) isn't asked
+        answers = _prompt_env_settings(env, {
+            "backups": (backups_enabled, yes or backups_enabled),
+            "tags": (tags, yes or bool(tags)),
+            "stripe": (env_stripe_api_key, yes or bool(env_stripe_api_key)),
+            "sendgrid": (sendgrid_api_key, yes or bool(sendgrid_api_key)),
+        })
+        env_backups_enabled[env] = bool(answers["backups"])
+        # Parsed once here so the config writer can use the list as-is
+        env_instance_tags[env] = _parse_tags(answers["tags"] or "")
+        env_stripe_api_keys[env] = answers["stripe"]
+        env_sendgrid_api_keys[env] = answers["sendgrid"]
+
+    if dns_future is not None:
+        domain_zone_id, dns_index, dns_error = dns_future.result()
+    else:
         domain_to_configure = typer.prompt("\nDomain to configure (e.g., example.com)")
+        domain_zone_id, dns_index, dns_error = _fetch_dns_index(domain_to_configure, cloudflare_api_key, no_cache)
 
-        # Get Zone ID via Cloudflare
-        domain_zone_id = cloudflare.get_cloudflare_zone_id(domain_to_configure, cloudflare_api_key)
-        dns_records = cloudflare.get_cloudflare_dns_records(domain_zone_id, cloudflare_api_key)
-
+    if dns_error:
+        console.print(dns_error)
+    if dns_index is not None:
+        console.print(f"Cloudflare zone ID for domain {domain_to_configure} is {domain_zone_id}\n")
         for env in envs:
-            if env == "prod":
-                # TODO: Turn these statements into a function
-                if cloudflare.root_domain_is_availabile(dns_records, domain_to_configure):
-                    console.print(f"[bold]{domain_to_configure}[/bold] (the root domain) is available!\n It will be used to host the [bold]front end[/bold] server for the [bold][{formatting.ENV_COLORS[env]}]production[/{formatting.ENV_COLORS[env]}][/bold] environment.\n")
-                else:
-                    console.print(f"[red][bold]Warning![/bold] The root domain [bold]{domain_to_configure}[/bold] has an existing A or CNAME record! It will be overwritten![/red]\n")
-
-                if cloudflare.subdomain_is_available(dns_records, "www", domain_to_configure):
-                    console.print(f"[bold]www.{domain_to_configure}[/bold] subdomain is available!\n")
-                else:
-                    console.print(f"[red][bold]Warning![/bold] The [bold]www.{domain_to_configure}[/bold] has an existing A or CNAME record! It will be overwritten![/red]\n")
-
-                if cloudflare.subdomain_is_available(dns_records, "api", domain_to_configure):
-                    console.print(f"[bold]api.{domain_to_configure}[/bold] subdomain is available!\nIt will be used to host the [bold]back end[/bold] server for the [bold][{formatting.ENV_COLORS[env]}]production[/{formatting.ENV_COLORS[env]}][/bold] environment.\n")
-                else:
-                    console.print(f"[red][bold]Warning![/bold] The [bold]api.{domain_to_configure}[/bold] has an existing A or CNAME record! It will be overwritten![/red]\n")
-            else:
-                if cloudflare.subdomain_is_available(dns_records, f"{env}", domain_to_configure):
-                    console.print(f"[bold]{env}.{domain_to_configure}[/bold] subdomain is available!\nIt will be used to host the [bold]front end[/bold] server for the [bold][{formatting.ENV_COLORS[env]}]{env}[/{formatting.ENV_COLORS[env]}][/bold] environment.\n")
-                else:
-                    console.print(f"[red][bold]{env}.{domain_to_configure}[/bold] subdomain is already taken![/red]\n")
-
-                if cloudflare.subdomain_is_available(dns_records, f"{env}-api", domain_to_configure):
-                    console.print(f"[bold]{env}-api.{domain_to_configure}[/bold] subdomain is available!\nIt will be used to host the [bold]back end[/bold] server for the [bold][{formatting.ENV_COLORS[env]}]{env}[/{formatting.ENV_COLORS[env]}][/bold] environment.\n")
-                else:
-                    console.print(f"[red][bold]{env}-api.{domain_to_configure}[/bold] subdomain is already taken![/red]\n")            
+            # One print per env: Rich parses the markup once for the whole block
+            console.print("\n\n".join(_dns_availability_lines(dns_index, env, domain_to_configure)) + "\n")
 
     # Persist full configuration as TOML — one file per environment
     out_dir = Path.cwd() / "config"
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # Serialize everything first, then write each env's files in parallel below:
+    # (config path, config bytes, .env path, .env bytes)
+    env_write_jobs: List[Tuple[Path, bytes, Path, bytes]] = []
+
+    # Sections shared by every environment are rendered to TOML once; inside
+    # the loop only the per-env sections are serialized and spliced in.
+    shared_toml = {
+        name: tomli_w.dumps({name: section})
+        for name, section in {
+            "project": {
+                "name": project_name,
+                "initialized": True,
+            },
+            "cloudflare": {
+                "account_id_saved": bool(cloudflare_account_id),
+                "api_key_saved": bool(cloudflare_api_key),
+            },
+            "domain": {"root": domain_to_configure},
+        }.items()
+    }
+
     for env_name in envs:
         # pick the instance type for this env (guard in case of missing key)
         instance_id = env_instance_types.get(env_name, "")
-        env_instance_tags.get(env_name, "")
         image_id = env_os_choices.get(env_name, "")
         stripe_api_key = env_stripe_api_keys.get(env_name, "")
         sendgrid_api_key = env_sendgrid_api_keys.get(env_name, "")
 
-
-        config_data = {
-            "project": {
-                "name": project_name,
-                "initialized": True,
-            },
+        env_sections = {
             # helpful to store which env this file represents
             "environment": {
                 "name": env_name
@@ -283,31 +495,40 @@ def init(
             "linode": {
                 "region": linode_region,
                 "backups_enabled": bool(env_backups_enabled[env_name]),
-                "tags": [t.strip() for t in env_instance_tags[env_name].split(",")] if env_instance_tags else [],
+                "tags": env_instance_tags.get(env_name, []),
                 # keep a single env block in each file for clarity
                 "instance_type": instance_id,
                 "image": image_id,
             },
-            "cloudflare": {
-                "account_id_saved": bool(cloudflare_account_id),
-                "api_key_saved": bool(cloudflare_api_key),
-            },
             "stripe": {"api_key_saved": bool(stripe_api_key)},
             "sendgrid": {"api_key_saved": bool(sendgrid_api_key)},
-            "domain": {"root": domain_to_configure},
         }
-
-        # Write ./config/<env>-config.toml
-        config_file = out_dir / f"{env_name}-config.toml"
-        config_file.write_text(dumps(config_data), encoding="utf-8")
-
-        project_env_file = out_dir / f"{env_name}.env"
-        project_env_file.write_text(
-            f"STRIPE_API_KEY={stripe_api_key}\n"
-            f"SENDGRID_API_KEY={sendgrid_api_key}\n",
-            encoding="utf-8"
+        config_toml = "\n".join(
+            shared_toml[name] if name in shared_toml else tomli_w.dumps({name: env_sections[name]})
+            for name in _CONFIG_SECTIONS
         )
 
+        # ./config/<env>-config.toml and ./config/<env>.env
+        env_write_jobs.append((
+            out_dir / f"{env_name}-config.toml",
+            config_toml.encode("utf-8"),
+            out_dir / f"{env_name}.env",
+            (
+                f"STRIPE_API_KEY={stripe_api_key}\n"
+                f"SENDGRID_API_KEY={sendgrid_api_key}\n"
+            ).encode("utf-8"),
+        ))
+
+    def write_env_files(job: Tuple[Path, bytes, Path, bytes]) -> None:
+        config_path, config_bytes, env_path, env_bytes = job
+        _atomic_write(config_path, config_bytes)
+        _atomic_write(env_path, env_bytes)
+
+    # Environments are independent (disjoint paths), so overlap their writes
+    # (helps on slow/network filesystems)
+    with ThreadPoolExecutor(max_workers=min(len(env_write_jobs), 4)) as executor:
+        list(executor.map(write_env_files, env_write_jobs))
+
     env_list = ", ".join(envs)
     console.print(f"[green]Configs for [bold]{env_list}[/bold] have been saved to the [bold]config[/bold] folder.[/green]")
     console.print(f"Initialization complete! You can now run [bold]scaletrail preview[/bold] and [bold]scaletrail deploy[/bold] to preview and deploy your infrastructure.")
@@ -337,6 +558,8 @@ def _pick_env_file(candidates: List[Path]) -> Path:
     if len(candidates) == 1:
         return candidates[0]
 
+    import inquirer
+
     choices = [c.name for c in candidates]
     answer = inquirer.prompt([
         inquirer.List(
@@ -351,70 +574,61 @@ def _pick_env_file(candidates: List[Path]) -> Path:
     return next(p for p in candidates if p.name == answer["cfg"])
 
 
-def _env_name_from_config_filename(config_path: Path) -> str:
+@lru_cache(maxsize=64)
+def _env_name_from_filename(filename: str) -> str:
     # e.g., dev-config.toml -> dev
-    stem = config_path.name
-    if stem.endswith("-config.toml"):
-        return stem[:-len("-config.toml")]
-    return stem.replace(".toml", "")
+    if filename.endswith("-config.toml"):
+        return filename[:-len("-config.toml")]
+    return filename.replace(".toml", "")
+
+
+def _env_name_from_config_filename(config_path: Path) -> str:
+    # Memoized on the bare filename (a str) so repeated lookups skip the slicing
+    return _env_name_from_filename(config_path.name)
 
 
 def _read_toml(path: Path) -> Dict[str, Any]:
+    # Read-only path, so the stdlib parser is enough (tomli backport on < 3.11)
     try:
-        return parse(path.read_text(encoding="utf-8"))
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    try:
+        # tomllib wants bytes; hand it the file directly rather than decoding first
+        with path.open("rb") as f:
+            return tomllib.load(f)
     except Exception as e:
         console.print(f"[red]Failed to parse TOML:[/red] {e}")
         raise typer.Exit(code=1)
 
 
 def _read_env_file(env_path: Path) -> Dict[str, str]:
-    if not env_path.exists():
-        return {}
+    # Same parser as init's ./.env, so both files follow one set of rules
+    return env_file.load_all(env_path)
 
-    data: Dict[str, str] = {}
-    for line in env_path.read_text(encoding="utf-8").splitlines():
-        if not line or line.strip().startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, val = line.split("=", 1)
-        data[key.strip()] = val.strip()
-    return data
 
+# Fixed fields of the records `preview` plans to create; only Name (and the
+# CNAME's Content) vary per environment
+_PLANNED_A_RECORD = {"Type": "A", "Content": "TBD (after create)", "Proxy": "Proxied", "TTL": "Auto"}
+_PLANNED_CNAME_RECORD = {"Type": "CNAME", "Proxy": "Proxied", "TTL": "Auto"}
 
-def _planned_dns_records(root: str, env_name: str) -> List[Dict[str, str]]:
-    records: List[Dict[str, str]] = []
+# Proxy column labels for the preview table
+_PROXIED_LABEL = "🟠 proxied"
+_DNS_ONLY_LABEL = "⚪"
 
 
+def _planned_dns_records(root: str, env_name: str) -> List[Dict[str, str]]:
     # <env>-api.<root> for non-prod environments
     if env_name and env_name.lower() not in ("prod", "production"):
-        records.append({
-            "Name": f"{env_name}-api.{root}",
-            "Type": "A",
-            "Content": "TBD (after create)",
-            "Proxy": "Proxied",
-            "TTL": "Auto",
-        })
-    else:
-        # api.<root>
-        records.append({
-            "Name": f"api.{root}",
-            "Type": "A",
-            "Content": "TBD (after create)",
-            "Proxy": "Proxied",
-            "TTL": "Auto",
-        })
+        return [{"Name": f"{env_name}-api.{root}", **_PLANNED_A_RECORD}]
 
+    return [
+        # api.<root>
+        {"Name": f"api.{root}", **_PLANNED_A_RECORD},
         # www CNAME → apex
-        records.append({
-            "Name": f"www.{root}",
-            "Type": "CNAME",
-            "Content": root,
-            "Proxy": "Proxied",
-            "TTL": "Auto",
-        })
-
-    return records
+        {"Name": f"www.{root}", "Content": root, **_PLANNED_CNAME_RECORD},
+    ]
 
 def _linode_table(cfg: Dict[str, Any]) -> Table:
     lin = cfg.get("linode", {})
@@ -465,14 +679,12 @@ def _cloudflare_table(cfg: Dict[str, Any], env_name: str, env_vars: Dict[str, st
     table.add_column("Proxy", justify="center")
 
     # planned DNS
-    dns_records = _planned_dns_records(root, env_name)
-    for r in dns_records:
-        table.add_row(
-            r["Name"],
-            r["Type"],
-            r["Content"],
-            "🟠 proxied" if r["Proxy"] == "Proxied" else "⚪",
-        )
+    rows = [
+        (r["Name"], r["Type"], r["Content"], _PROXIED_LABEL if r["Proxy"] == "Proxied" else _DNS_ONLY_LABEL)
+        for r in _planned_dns_records(root, env_name)
+    ]
+    for row in rows:
+        table.add_row(*row)
 
     return table
 
@@ -1,49 +1,102 @@
-from typing import Any, Dict, List, Optional
-import typer
-import requests
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
-from rich.console import Console
-from rich_pyfiglet import RichFiglet
+from scaletrail.utils.http_client import cached_get
+
+# Cloudflare defaults to 100 records per page for the DNS records endpoint
+DNS_RECORDS_PER_PAGE = 100
+
+# How long (seconds) cached Cloudflare responses stay fresh. Zone IDs are
+# effectively permanent (only found zones are cached; a "no such zone" answer
+# is always refetched); DNS records are kept short so a retried `init` still
+# sees recent changes.
+ZONE_ID_TTL = 24 * 60 * 60
+DNS_RECORDS_TTL = 30
+
+def _has_result(data: Any) -> bool:
+    # Cloudflare answers "no such zone" with a successful, empty result list;
+    # that's about to change once the user adds the zone, so never cache it
+    return isinstance(data, dict) and bool(data.get("result"))
+
+def _cloudflare_get(url: str, cloudflare_api_key: str, params: Dict[str, Any], ttl: int,
+                    should_cache: Optional[Callable[[Any], bool]] = None) -> Optional[Dict[str, Any]]:
+    """GET a Cloudflare API endpoint (through the on-disk cache); None if the call failed."""
+    # requests is only imported once a network call is actually being made
+    # (see http_client.get_session); by this point it's already loaded
+    import requests
 
-console = Console()
-def get_cloudflare_zone_id(domain: str, cloudflare_api_key: str) -> Optional[str]:
-    """Fetches the Cloudflare Zone ID for a given domain."""
-    url = "https://api.cloudflare.com/client/v4/zones"
     headers = {
         "Authorization": f"Bearer {cloudflare_api_key}",
         "Content-Type": "application/json"
     }
-    params = {"name": domain}
-
-    response = requests.get(url, headers=headers, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        if data.get("success") and data.get("result"):
-            print(f"Cloudflare zone ID for domain {domain} is {data['result'][0]['id']}\n")
-            return data["result"][0]["id"]
-    console.print(f"[red]Error fetching Zone ID for domain {domain}[/red]")
+    try:
+        data = cached_get(url, headers=headers, params=params, ttl=ttl, namespace="cloudflare",
+                          should_cache=should_cache)
+    except ValueError:
+        return None  # non-JSON body, e.g. an HTML error page
+    except requests.RequestException:
+        return None  # connection error, timeout, or retries exhausted
+    if isinstance(data, dict) and data.get("success"):
+        return data
     return None
 
-def get_cloudflare_dns_records(zone_id: str, cloudflare_api_key: str) -> Optional[List[Dict[str, Any]]]:
-    """Fetches DNS records for a given Cloudflare Zone ID."""
+def get_cloudflare_zone_id(domain: str, cloudflare_api_key: str, ttl: int = ZONE_ID_TTL) -> Optional[str]:
+    """
+    Fetches the Cloudflare Zone ID for a given domain; None if it couldn't be
+    fetched. Doesn't print, so it's safe to call off the main thread.
+    """
+    url = "https://api.cloudflare.com/client/v4/zones"
+    data = _cloudflare_get(url, cloudflare_api_key, {"name": domain}, ttl, should_cache=_has_result)
+    if data and data.get("result"):
+        return data["result"][0]["id"]
+    return None
+
+def get_cloudflare_dns_records(zone_id: str, cloudflare_api_key: str,
+                               ttl: int = DNS_RECORDS_TTL) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetches DNS records for a given Cloudflare Zone ID.
+
+    Cloudflare paginates this endpoint; the first page tells us how many pages
+    there are, and any remaining pages are fetched concurrently.
+    Returns None if any page couldn't be fetched. Doesn't print, so it's safe
+    to call off the main thread.
+    """
     url = f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records"
-    headers = {
-        "Authorization": f"Bearer {cloudflare_api_key}",
-        "Content-Type": "application/json"
-    }
 
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        data = response.json()
-        if data.get("success"):
-            return data.get("result", [])
-    console.print(f"[red]Error fetching DNS records for zone ID {zone_id}[/red]")
-    return None
+    def fetch_page(page: int) -> Optional[Dict[str, Any]]:
+        return _cloudflare_get(url, cloudflare_api_key, {"page": page, "per_page": DNS_RECORDS_PER_PAGE}, ttl)
+
+    first = fetch_page(1)
+    if first is None:
+        return None
 
-def subdomain_is_available(records, subdomain, root_domain):
+    records = list(first.get("result", []))
+    total_pages = (first.get("result_info") or {}).get("total_pages") or 1
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(8, total_pages - 1)) as executor:
+            for data in executor.map(fetch_page, range(2, total_pages + 1)):
+                if data is None:
+                    return None
+                records.extend(data.get("result", []))
+    return records
+
+def build_dns_index(records: Optional[List[Dict[str, Any]]]) -> FrozenSet[Tuple[str, str]]:
+    """
+    Build a set of (lower-cased name, TYPE) pairs for a zone's A and CNAME
+    records, so availability checks are constant-time membership tests
+    instead of a scan over every record.
+    """
+    return frozenset(
+        (r.get("name", "").lower(), r.get("type", "").upper())
+        for r in records or []
+        if r.get("type", "").upper() in ("A", "CNAME")
+    )
+
+def subdomain_is_available(dns_index, subdomain, root_domain):
     """
     Checks whether a given subdomain (like 'dev') or the root domain
     already exists as an A or CNAME record.
+    `dns_index` is the output of `build_dns_index()`.
     Returns True if available, False if it already exists.
     """
     # Handle root domain (no subdomain)
@@ -52,14 +105,7 @@ def subdomain_is_available(records, subdomain, root_domain):
     else:
         target_name = f"{subdomain}.{root_domain}".lower()
 
-    for record in records:
-        record_name = record.get("name", "").lower()
-        record_type = record.get("type", "").upper()
-
-        if record_type in ("A", "CNAME") and record_name == target_name:
-            return False  # already exists (not available)
-
-    return True  # available
+    return (target_name, "A") not in dns_index and (target_name, "CNAME") not in dns_index
 
-def root_domain_is_availabile(records, root_domain):
-    return subdomain_is_available(records, "", root_domain)
\ No newline at end of file
+def root_domain_is_availabile(dns_index, root_domain):
+    return subdomain_is_available(dns_index, "", root_domain)
\ No newline at end of file
@@ -1,24 +1,27 @@
 from pathlib import Path
+from dotenv import dotenv_values
 from rich.console import Console
 console = Console()
 import os
 
 
-def api_key_present(env_key):
-    current_dir = Path.cwd()
-    env_path = current_dir / ".env"
-    if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                if line.startswith(f"{env_key}="):
-                    key = line.split("=", 1)[1].strip()
-                    if key:
-                        console.print(f"{env_key} found.")
-                        return True
-    return False
+def load_all(env_path=None):
+    """
+    Reads a .env file (./.env by default) once and returns its non-empty
+    KEY=value pairs as a dict. Parsed by python-dotenv (quotes, inline
+    comments, `export`, CRLF), so the values match what load_dotenv()/os.getenv
+    see. A missing file gives an empty dict.
+    """
+    if env_path is None:
+        env_path = Path.cwd() / ".env"
+    return {k: v for k, v in dotenv_values(env_path).items() if v}
 
 def add_api_key(env_key, env_value):
     """Adds or updates an API key in the .env file."""
+    add_api_keys({env_key: env_value})
+
+def add_api_keys(values):
+    """Adds or updates several API keys in the .env file with a single rewrite."""
     env_path = Path.cwd() / ".env"
 
     # Ensure the file exists
@@ -29,25 +32,28 @@ def add_api_key(env_key, env_value):
     with open(env_path, "r") as f:
         lines = f.readlines()
 
-    key_exists = False
+    pending = dict(values)
     new_lines = []
 
     for line in lines:
-        if line.startswith(f"{env_key}="):
-            new_lines.append(f"{env_key}={env_value}\n")
-            key_exists = True
+        env_key = line.split("=", 1)[0] if "=" in line else None
+        if env_key in pending:
+            new_lines.append(f"{env_key}={pending.pop(env_key)}\n")
         else:
             new_lines.append(line)
 
-    # If the key was not found, append it
-    if not key_exists:
+    # Append any keys that weren't found
+    if new_lines and not new_lines[-1].endswith("\n"):
+        new_lines[-1] += "\n"
+    for env_key, env_value in pending.items():
         new_lines.append(f"{env_key}={env_value}\n")
 
     # Write updated lines back to .env
     with open(env_path, "w") as f:
         f.writelines(new_lines)
 
-    print(f"Set {env_key} in {env_path}")
+    for env_key in values:
+        print(f"Set {env_key} in {env_path}")
 
 def find_or_create_env_file():
     """Creates a .env file in the current directory if it doesn't exist."""
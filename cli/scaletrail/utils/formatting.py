@@ -1,10 +1,13 @@
 from rich.console import Console
-from rich_pyfiglet import RichFiglet
 
 console = Console()
 
 def show_banner():
     """Helper function to print the CLI banner."""
+    # rich_pyfiglet pulls in pyfiglet and its font loading; only pay for it
+    # when the banner is actually shown.
+    from rich_pyfiglet import RichFiglet
+
     rich_fig = RichFiglet(
         "ScaleTrail",
         font="slant",
@@ -29,7 +32,7 @@ def _fmt_money(v: float) -> str:
 
 def _row(inst: dict) -> str:
     label = inst.get("label", "")
-    cls = inst.get("class", "")
+    cls = inst.get("class") or ""
     mem_gb = _gb_from_mb(inst.get("memory_mb", 0))
     disk_gb = _gb_from_mb(inst.get("disk_mb", 0))
     xfer_gb = inst.get("transfer_gb", 0)
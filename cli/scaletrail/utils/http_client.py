@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    # orjson parses the larger Linode payloads (e.g. /v4/images) several times
+    # faster than the stdlib; it's optional (`pip install scaletrail[fast]`).
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# (connect, read) timeout in seconds for every outbound API call, so a hung
+# edge node can't wedge `init` or hold a pooled connection indefinitely
+HTTP_TIMEOUT = (3.05, 30)
+
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """
+    Return the shared session used for all Linode/Cloudflare API calls,
+    building it on first use.
+
+    Reusing a single session keeps connections to api.linode.com and
+    api.cloudflare.com alive between requests, so only the first call to
+    each host pays for the TCP + TLS handshake. requests is imported here
+    rather than at module level so commands that never touch the network
+    (`--help`, `preview`, `deploy`) don't pay for importing it.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def _build_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    # Every API we talk to speaks JSON
+    session.headers["Accept"] = "application/json"
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries, pool_block=False)
+    session.mount("https://", adapter)
+    return session
+
+
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "scaletrail"
+
+
+def _cache_path(namespace: str, url: str, headers: Optional[Dict[str, str]],
+                params: Optional[Dict[str, Any]]) -> Path:
+    # Key on the auth scope, any server-side filter and the query params too,
+    # so different API keys, filters or pages never share an entry
+    headers = headers or {}
+    auth = headers.get("Authorization", "")
+    api_filter = headers.get("X-Filter", "")
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    digest = hashlib.sha1(f"{url}\n{query}\n{auth}\n{api_filter}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / namespace / f"{digest}.json"
+
+
+def cached_get(url: str, headers: Optional[Dict[str, str]] = None,
+               params: Optional[Dict[str, Any]] = None, ttl: int = 3600,
+               namespace: str = "", should_cache: Optional[Callable[[Any], bool]] = None) -> Any:
+    """
+    GET `url` and return the parsed JSON body, serving it from an on-disk
+    cache when a copy younger than `ttl` seconds exists. `ttl=0` always goes
+    to the network (the fresh response still refreshes the cache).
+
+    Once an entry is stale, it is revalidated with `If-None-Match` if the
+    server sent an `ETag`; a 304 reply reuses the cached body and resets its
+    age. Servers without ETags simply get a full refetch after `ttl`.
+
+    Entries live under ~/.cache/scaletrail/<namespace>/. Only 200 responses
+    that don't report `"success": false` (Cloudflare's error envelope) are
+    cached. `should_cache(data)`, if given, can veto caching a body (e.g. an
+    empty "not found" result); cached bodies it rejects are ignored too, so
+    they're refetched.
+    """
+    path = _cache_path(namespace, url, headers, params)
+    etag_path = path.with_suffix(".etag")
+    request_headers = dict(headers or {})
+    try:
+        if ttl > 0:
+            if time.time() - path.stat().st_mtime < ttl:
+                data = json_loads(path.read_bytes())
+                if should_cache is None or should_cache(data):
+                    return data
+            if etag_path.exists():
+                request_headers["If-None-Match"] = etag_path.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        pass  # missing or unreadable cache entry; fall through to the network
+
+    response = get_session().get(url, headers=request_headers, params=params, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304:
+        try:
+            data = json_loads(path.read_bytes())
+            path.touch()
+            return data
+        except (OSError, ValueError):
+            # cache entry vanished between the check and now; fetch it unconditionally
+            request_headers.pop("If-None-Match", None)
+            response = get_session().get(url, headers=request_headers, params=params, timeout=HTTP_TIMEOUT)
+
+    data = json_loads(response.content)
+    if (response.status_code == 200 and not (isinstance(data, dict) and data.get("success") is False)
+            and (should_cache is None or should_cache(data))):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(response.content)
+            etag = response.headers.get("ETag")
+            if etag:
+                etag_path.write_text(etag, encoding="utf-8")
+            elif etag_path.exists():
+                etag_path.unlink()
+        except OSError:
+            pass  # caching is best-effort
+    return data
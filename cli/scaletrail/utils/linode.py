@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional
-import inquirer
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 from scaletrail.utils import formatting
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 
 
 CONTINENT_CHOICES = [
@@ -67,23 +69,39 @@ CONTINENT_TO_REGIONS = {
     "Oceania": OCEANIA_LINODE_REGIONS,
 }
 
+# Every region above, in continent order (backs the "Show all regions" choice)
+ALL_LINODE_REGIONS = list(chain.from_iterable(CONTINENT_TO_REGIONS.values()))
 
-def _pick_price(item: Dict[str, Any], region_id: str) -> Dict[str, float]:
+# Reverse/set views of CONTINENT_TO_REGIONS for O(1) "which continent?" and
+# "is this region in that continent?" lookups
+REGION_TO_CONTINENT = {r: c for c, rs in CONTINENT_TO_REGIONS.items() for r in rs}
+CONTINENT_REGION_SETS = {c: frozenset(rs) for c, rs in CONTINENT_TO_REGIONS.items()}
+
+
+def _region_price(priced: Dict[str, Any], region_id: str) -> Dict[str, float]:
     """
-    Return {"hourly": x, "monthly": y} using region override if present,
-    otherwise the base price.
+    Return {"hourly": x, "monthly": y} for anything shaped like a Linode
+    priced object (a type, or its backups addon): the `region_prices`
+    override for `region_id` if present, otherwise the base `price`.
     """
-    base = item.get("price", {}) or {}
+    base = priced.get("price") or {}
     hourly = base.get("hourly")
     monthly = base.get("monthly")
 
-    for rp in item.get("region_prices", []) or []:
+    for rp in priced.get("region_prices", []) or []:
         if rp.get("id") == region_id:
             hourly = rp.get("hourly", hourly)
             monthly = rp.get("monthly", monthly)
             break
     return {"hourly": float(hourly), "monthly": float(monthly)}
 
+def _pick_price(item: Dict[str, Any], region_id: str) -> Dict[str, float]:
+    """
+    Return {"hourly": x, "monthly": y} using region override if present,
+    otherwise the base price.
+    """
+    return _region_price(item, region_id)
+
 def _pick_backup_price(item: Dict[str, Any], region_id: str) -> Optional[Dict[str, float]]:
     """
     Same as _pick_price but for the backups addon. Returns None if no backups addon.
@@ -91,38 +109,75 @@ def _pick_backup_price(item: Dict[str, Any], region_id: str) -> Optional[Dict[st
     backups = (item.get("addons") or {}).get("backups")
     if not backups:
         return None
-
-    base = (backups.get("price") or {})
-    hourly = base.get("hourly")
-    monthly = base.get("monthly")
-
-    for rp in backups.get("region_prices", []) or []:
-        if rp.get("id") == region_id:
-            hourly = rp.get("hourly", hourly)
-            monthly = rp.get("monthly", monthly)
-            break
-
-    return {"hourly": float(hourly), "monthly": float(monthly)}
+    return _region_price(backups, region_id)
+
+# Column headers for choose_instance(); widths match formatting._row()
+_INSTANCE_HEADER = (
+    f"{'Label':<18} | "
+    f"{'Class':<9} | "
+    f"{'Mem GB':>6} | "
+    f"{'Disk GB':>7} | "
+    f"{'Transfer GB':>11} | "
+    f"{'Monthly':>10} | "
+    f"{'Backups Monthly':>14}"
+)
+
+# Lists longer than this are narrowed with an extra prompt before showing them
+MAX_PROMPT_CHOICES = 20
+
+def _plan_class(inst: Dict[str, Any]) -> str:
+    # Plans with a missing/None class are grouped (and filtered) under ""
+    return inst.get("class") or ""
+
+def _choose_instance_class(instances_sorted: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Prompt for a plan class among `instances_sorted` (already sorted by
+    monthly price). Returns the class, or None if cancelled.
+    """
+    import inquirer
+
+    # class -> (plan count, cheapest monthly price), in cheapest-first order
+    summary: Dict[str, List[Any]] = {}
+    for inst in instances_sorted:
+        entry = summary.setdefault(_plan_class(inst), [0, inst.get("price_monthly", 0.0)])
+        entry[0] += 1
+    if len(summary) == 1:
+        return next(iter(summary))
+
+    choices = [
+        (f"{cls or 'other':<10} {count} plans, from {formatting._fmt_money(cheapest)}/mo", cls)
+        for cls, (count, cheapest) in summary.items()
+    ]
+    answers = inquirer.prompt([
+        inquirer.List("plan_class", message="Select a plan class", choices=choices, carousel=True)
+    ])
+    if not answers:
+        return None
+    return answers["plan_class"]
 
 def choose_instance(instances: list, message: str = "Select a Linode plan for the environment"):
+    import inquirer
+
     instances_sorted = sorted(instances, key=lambda x: x.get("price_monthly", 0))
 
-    header = (
-        f"{'Label':<18} | "
-        f"{'Class':<9} | "
-        f"{'Mem GB':>6} | "
-        f"{'Disk GB':>7} | "
-        f"{'Transfer GB':>11} | "
-        f"{'Monthly':>10} | "
-        f"{'Backups Monthly':>14}"
-    )
+    # inquirer only shows a 13-row window of a long list, so dozens of plans
+    # mean a lot of scrolling; pick a plan class first and only list that
+    # class's plans
+    if len(instances_sorted) > MAX_PROMPT_CHOICES:
+        plan_class = _choose_instance_class(instances_sorted)
+        if plan_class is None:
+            return None
+        instances_sorted = [i for i in instances_sorted if _plan_class(i) == plan_class]
 
     # Show header above the prompt
-    print(header)
-    print("-" * len(header))
+    print(_INSTANCE_HEADER)
+    print("-" * len(_INSTANCE_HEADER))
 
-    # python-inquirer expects choices as strings OR (name, value) tuples
-    choices = [(formatting._row(inst), inst["id"]) for inst in instances_sorted]
+    # python-inquirer expects choices as strings OR (name, value) tuples.
+    # The value is the plan's position, so the answer indexes straight back
+    # into the list (inquirer hashes values, so the dicts can't be used).
+    row = formatting._row
+    choices = [(row(inst), idx) for idx, inst in enumerate(instances_sorted)]
 
     questions = [
         inquirer.List(
@@ -133,46 +188,70 @@ def choose_instance(instances: list, message: str = "Select a Linode plan for th
         )
     ]
     answers = inquirer.prompt(questions)
-    if not answers:
+    if not answers or answers.get("selected") is None:
         return None
 
-    selected_id = answers["selected"]
-    # return full instance (not just id)
-    return next((i for i in instances if i["id"] == selected_id), None)
+    # return full instance (not just its position)
+    return instances_sorted[answers["selected"]]
+
+def _instance_row(itm: Dict[str, Any], price: Dict[str, float],
+                  backup_price: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    get = itm.get
+    return {
+        "id": get("id"),
+        "label": get("label"),
+        "class": get("class"),
+        "vcpus": get("vcpus"),
+        "memory_mb": get("memory"),
+        "disk_mb": get("disk"),
+        "transfer_gb": get("transfer"),
+        "gpus": get("gpus"),
+        "network_out_mbps": get("network_out"),
+        "price_hourly": price["hourly"],
+        "price_monthly": price["monthly"],
+        "backups_hourly": backup_price["hourly"] if backup_price else None,
+        "backups_monthly": backup_price["monthly"] if backup_price else None,
+    }
 
 def get_instances_for_region(resp: Dict[str, Any], region_id: str, 
-                             include_classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                             include_classes: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
     """
     Flatten the Linode types payload into a list of dicts with the right
     price for `region_id`. Optionally filter by class (e.g., ["standard","dedicated"]).
+    Rows come back sorted by monthly price, cheapest first.
     """
-    out: List[Dict[str, Any]] = []
-    for itm in resp.get("data", []) or []:
-        if include_classes and itm.get("class") not in include_classes:
-            continue
+    classes = frozenset(include_classes) if include_classes else None
+    rows = [
+        _instance_row(itm, _pick_price(itm, region_id), _pick_backup_price(itm, region_id))
+        for itm in resp.get("data", []) or []
+        if classes is None or itm.get("class") in classes
+    ]
+    # Sorted once here, so choose_instance's per-environment sort runs over
+    # already-ordered input (a single linear pass for Timsort)
+    rows.sort(key=itemgetter("price_monthly"))
+    return rows
+
+
+_OS_HEADER = f"{'Vendor':<10} | {'Label':<25} | Description"
+
+def _os_choice_label(img: Dict[str, Any]) -> str:
+    vendor = img.get("vendor") or "Unknown"
+    label = img.get("label") or img.get("id")
+    desc = img.get("description") or ""
+    eol_flag = " (EOL)" if img.get("deprecated") or img.get("eol") else ""
+    return f"{vendor:<10} | {label:<25} {eol_flag} - {desc[:60]}".strip()
+
+def os_choices(oses: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+    """
+    Build the (label, index into `oses`) prompt choices for `oses`. Callers
+    that prompt several times over the same list (one per environment) can
+    build these once and pass them to `choose_os(..., choices=...)`.
+    """
+    return [(_os_choice_label(img), idx) for idx, img in enumerate(oses)]
 
-        price = _pick_price(itm, region_id)
-        backup_price = _pick_backup_price(itm, region_id)
-
-        out.append({
-            "id": itm.get("id"),
-            "label": itm.get("label"),
-            "class": itm.get("class"),
-            "vcpus": itm.get("vcpus"),
-            "memory_mb": itm.get("memory"),
-            "disk_mb": itm.get("disk"),
-            "transfer_gb": itm.get("transfer"),
-            "gpus": itm.get("gpus"),
-            "network_out_mbps": itm.get("network_out"),
-            "price_hourly": price["hourly"],
-            "price_monthly": price["monthly"],
-            "backups_hourly": backup_price["hourly"] if backup_price else None,
-            "backups_monthly": backup_price["monthly"] if backup_price else None,
-        })
-    return out
-
-
-def choose_os(oses: List[Dict[str, Any]], message: str = "Select an operating system"):
+
+def choose_os(oses: List[Dict[str, Any]], message: str = "Select an operating system",
+              choices: Optional[List[Tuple[str, int]]] = None):
     """
     Prompt the user to choose an operating system from the available Linode images.
 
@@ -184,26 +263,26 @@ def choose_os(oses: List[Dict[str, Any]], message: str = "Select an operating sy
     message : str
         The message to display in the selection prompt.
 
+    choices : list[tuple[str, int]] | None
+        Prebuilt `os_choices(oses)` for this same `oses` list; built here if
+        not given.
+
     Returns
     -------
     dict | None
         The full OS image dictionary for the selected choice, or None if cancelled.
     """
+    import inquirer
+
     if not oses:
         print("No operating systems available for this region.")
         return None
 
     # Construct readable names for the prompt
-    choices = []
-    for img in oses:
-        vendor = img.get("vendor") or "Unknown"
-        label = img.get("label") or img.get("id")
-        desc = img.get("description") or ""
-        eol_flag = " (EOL)" if img.get("deprecated") or img.get("eol") else ""
-        choice_label = f"{vendor:<10} | {label:<25} {eol_flag} - {desc[:60]}"
-        choices.append((choice_label.strip(), img["id"]))
-
-    print(f"{'Vendor':<10} | {'Label':<25} | Description")
+    if choices is None:
+        choices = os_choices(oses)
+
+    print(_OS_HEADER)
     print("-" * 80)
 
     questions = [
@@ -219,9 +298,11 @@ def choose_os(oses: List[Dict[str, Any]], message: str = "Select an operating sy
     if not answers:
         return None
 
-    selected_id = answers["selected"]
-    return next((os for os in oses if os["id"] == selected_id), None)
+    return oses[answers["selected"]]
 
+# Images share a handful of distinct EOL strings (one per distro release), so
+# each is only parsed once. Safe to cache: str in, immutable datetime out.
+@lru_cache(maxsize=256)
 def _parse_iso(dt: Optional[str]) -> Optional[datetime]:
     if not dt:
         return None
@@ -232,20 +313,20 @@ def _parse_iso(dt: Optional[str]) -> Optional[datetime]:
     except Exception:
         return None
 
-def _eol_has_passed(eol: Optional[str]) -> bool:
+def _eol_has_passed(eol: Optional[str], now: Optional[datetime] = None) -> bool:
     dt = _parse_iso(eol)
     if not dt:
         return False
-    return datetime.now(timezone.utc) >= dt
+    return (now or datetime.now(timezone.utc)) >= dt
 
 def get_operating_systems_for_region(
     images_resp: Dict[str, Any],
     region_id: str,
-    include_vendors: Optional[List[str]] = None,
+    include_vendors: Optional[Sequence[str]] = None,
     public_only: bool = True,
     exclude_eol: bool = True,
     require_status_available: bool = True,
-    required_capabilities: Optional[List[str]] = None,
+    required_capabilities: Optional[Sequence[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Normalize/filter Linode Images (OSes) for a specific region.
@@ -259,7 +340,7 @@ def get_operating_systems_for_region(
     region_id : str
         Region slug (e.g., "us-east", "us-ord", "br-gru", "jp-tyo-3").
 
-    include_vendors : list[str] | None
+    include_vendors : Sequence[str] | None
         If given, keep only images whose `vendor` (case-insensitive) is in this list.
 
     public_only : bool
@@ -271,7 +352,7 @@ def get_operating_systems_for_region(
     require_status_available : bool
         If True (default), include only images where `status == "available"`.
 
-    required_capabilities : list[str] | None
+    required_capabilities : Sequence[str] | None
         If provided, keep only images that include *all* these capabilities
         (e.g., ["cloud-init"]).
 
@@ -288,66 +369,83 @@ def get_operating_systems_for_region(
         - is_public, deprecated, eol (raw), eol_passed (bool)
         - regions (list | None), status, capabilities (list)
     """
-    out: List[Dict[str, Any]] = []
+    # Accepted images as ((lowercased vendor, lowercased label), row); the sort
+    # key is computed in the same pass that filters and builds the row
+    keyed: List[Tuple[Tuple[str, str], Dict[str, Any]]] = []
 
-    vendor_allow: Optional[set] = None
+    vendor_allow: Optional[FrozenSet[str]] = None
     if include_vendors:
-        vendor_allow = {v.strip().lower() for v in include_vendors if v and v.strip()}
+        vendor_allow = frozenset(v.strip().lower() for v in include_vendors if v and v.strip())
 
-    need_caps: Optional[set] = None
+    # A tuple (deduplicated, order kept) is the cheapest thing to iterate for
+    # the per-image "all present?" probe below
+    need_caps: Optional[Tuple[str, ...]] = None
     if required_capabilities:
-        need_caps = {c.strip() for c in required_capabilities if c and c.strip()}
+        need_caps = tuple(dict.fromkeys(c.strip() for c in required_capabilities if c and c.strip()))
+
+    # One "now" for the whole pass, rather than a clock read per image
+    now = datetime.now(timezone.utc)
 
     for img in images_resp.get("data", []) or []:
+        get = img.get  # bound once; every field below is read through it
+
         # public filter
-        if public_only and not img.get("is_public", False):
+        if public_only and not get("is_public", False):
             continue
 
-        # vendor filter (case-insensitive)
-        vendor = (img.get("vendor") or "").strip()
-        if vendor_allow is not None and vendor.lower() not in vendor_allow:
+        # vendor filter (case-insensitive); only normalize when filtering
+        vendor = get("vendor") or ""
+        if vendor_allow is not None and vendor.strip().lower() not in vendor_allow:
             continue
 
         # status filter
-        if require_status_available and img.get("status") != "available":
+        if require_status_available and get("status") != "available":
             continue
 
-        # capability filter
-        caps = img.get("capabilities") or []
-        if need_caps and not need_caps.issubset(set(caps)):
+        # region gating (the most selective check, so it runs before the
+        # capability/EOL work; one scan of a ~30-slug list is cheaper than
+        # building a set or index for a single lookup)
+        regions = get("regions")
+        if isinstance(regions, list) and regions and region_id not in regions:
             continue
-
-        # region gating
-        regions = img.get("regions")
-        if isinstance(regions, list) and len(regions) > 0:
-            if region_id not in regions:
-                continue
         # If regions is None or empty list, treat as globally available
 
-        # EOL/Deprecated filtering
-        deprecated = bool(img.get("deprecated"))
-        eol_raw = img.get("eol")
-        eol_passed = _eol_has_passed(eol_raw)
-        if exclude_eol and (deprecated or eol_passed):
+        # capability filter
+        # (need_caps is a handful of names, so probe the list directly instead
+        # of building a set from every image's capabilities)
+        caps = get("capabilities") or []
+        if need_caps and any(c not in caps for c in need_caps):
+            continue
+
+        # EOL/Deprecated filtering (a deprecated image is dropped without
+        # parsing its EOL date at all)
+        deprecated = bool(get("deprecated"))
+        if exclude_eol and deprecated:
+            continue
+        eol_raw = get("eol")
+        eol_passed = _eol_has_passed(eol_raw, now)
+        if exclude_eol and eol_passed:
             continue
 
-        out.append({
-            "id": img.get("id"),
-            "label": img.get("label"),
-            "vendor": vendor or None,
-            "description": img.get("description") or "",
-            "size": img.get("size"),
-            "created": img.get("created"),
-            "updated": img.get("updated"),
-            "is_public": bool(img.get("is_public")),
+        row = {
+            "id": get("id"),
+            "label": get("label"),
+            "vendor": vendor.strip() or None,
+            "description": get("description") or "",
+            "size": get("size"),
+            "created": get("created"),
+            "updated": get("updated"),
+            "is_public": bool(get("is_public")),
             "deprecated": deprecated,
             "eol": eol_raw,
             "eol_passed": eol_passed,
-            "regions": regions if regions is not None else None,
-            "status": img.get("status"),
+            "regions": regions,
+            "status": get("status"),
             "capabilities": caps,
-        })
+        }
+        keyed.append((((row["vendor"] or "").lower(), (row["label"] or "").lower()), row))
 
-    # Stable, readable ordering: vendor -> label
-    out.sort(key=lambda x: ((x.get("vendor") or "").lower(), (x.get("label") or "").lower()))
-    return out
\ No newline at end of file
+    # Stable, readable ordering: vendor -> label. Sorting on the key alone
+    # (never the row dicts) keeps ties in catalog order.
+    keyed.sort(key=itemgetter(0))
+    return [row for _, row in keyed]
\ No newline at end of file